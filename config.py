@@ -58,6 +58,7 @@ PRODUCT_TEMP_C = 25  # °C - Final product temperature
 GLUCOSE_PRICE = 0.35  # Industrial glucose
 LACTIC_ACID_PRICE = 1.50  # 80-88% industrial grade
 NUTRIENTS_PRICE = 0.20  # Yeast extract, minerals
+NUTRIENTS_LOADING = 0.05  # kg nutrients / kg glucose
 
 # TEA Settings
 IRR_TARGET = 0.10  # 10% target internal rate of return
@@ -10,6 +10,13 @@ Author: Susila Hadiyati
 Date: October 2025
 """
 
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+
 import biosteam as bst
 import thermosteam as tmo
 from biosteam.units import HXutility, SolidsCentrifuge
@@ -23,131 +30,56 @@ import config
 import warnings
 warnings.filterwarnings('ignore', category=RuntimeWarning)
 
-# =============================================================================
-# Setup BioSTEAM Environment
-# =============================================================================
-
-print("="*80)
-print("LACTIC ACID BIOREFINERY - BioSTEAM SIMULATION")
-print("="*80)
-print(f"BioSTEAM version: {bst.__version__}")
-print(f"ThermoSTEAM version: {tmo.__version__}")
-print("-"*80)
-
-bst.CE = config.CEPCI
-bst.PowerUtility.price = config.ELECTRICITY_PRICE
-bst.main_flowsheet.set_flowsheet('lactic_acid')
-
 # =============================================================================
 # Define Chemicals
 # =============================================================================
 
-# Try to load WWTsludge, if not available, create it
-try:
-    chems = tmo.Chemicals(['Water', 'Glucose', 'LacticAcid', 'Ethanol', 'WWTsludge'])
-except:
-    print("Note: Creating custom biomass chemical (WWTsludge not in database)")
-    from thermosteam import Chemical
-    
-    # Load standard chemicals
-    chems = tmo.Chemicals(['Water', 'Glucose', 'LacticAcid', 'Ethanol'])
-    
-    # Create biomass as a blank chemical
-    WWTsludge = Chemical.blank('WWTsludge', phase='s', formula='CH1.8O0.5N0.2')
-    WWTsludge.default()
+# Compiled chemicals are pickled here after the first run; the file is
+# tagged with the ThermoSTEAM version and a hash of create_chemicals, and
+# rebuilt whenever either changes
+CHEMICALS_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'la_chems.pkl')
+
+def create_chemicals():
+    """Load process chemicals, creating biomass if it is not in the database."""
+    # Try to load WWTsludge, if not available, create it
+    try:
+        chems = tmo.Chemicals(['Water', 'Glucose', 'LacticAcid', 'Ethanol', 'WWTsludge'])
+    except:
+        print("Note: Creating custom biomass chemical (WWTsludge not in database)")
+        from thermosteam import Chemical
+        
+        # Load standard chemicals
+        chems = tmo.Chemicals(['Water', 'Glucose', 'LacticAcid', 'Ethanol'])
+        
+        # Create biomass as a blank chemical
+        WWTsludge = Chemical.blank('WWTsludge', phase='s', formula='CH1.8O0.5N0.2')
+        WWTsludge.default()
+        
+        chems.append(WWTsludge)
     
-    chems.append(WWTsludge)
-
-tmo.settings.set_thermo(chems)
-
-print("\nChemicals loaded:")
-for chem in chems:
-    print(f"  - {chem.ID}: {chem.formula}")
-print("-"*80)
-
-# =============================================================================
-# Display Configuration
-# =============================================================================
-
-print(f"\nProduction Target: {config.ANNUAL_PRODUCTION_TARGET:,} MT/year")
-print(f"Operating days: {config.OPERATING_DAYS} days/year")
-print(f"Required LA production rate: {config.LA_PRODUCTION_RATE:.1f} kg/hr")
-print(f"Required glucose feed rate: {config.GLUCOSE_FEED_RATE:.1f} kg/hr")
-print("-"*80)
-
-# =============================================================================
-# Create Streams
-# =============================================================================
-
-glucose_feed = Stream(
-    'glucose_feed',
-    Glucose=config.GLUCOSE_FEED_RATE,
-    Water=config.GLUCOSE_FEED_RATE * 4,  # 20% w/w solution
-    T=config.FEED_TEMP_C + 273.15,
-    P=101325,
-    units='kg/hr'
-)
-
-# =============================================================================
-# Unit Operations
-# =============================================================================
-
-# H101: Feed Sterilization
-H101 = HXutility('H101', ins=glucose_feed, T=config.STERILIZATION_TEMP_C + 273.15)
-
-# H102: Cooling to fermentation temperature
-H102 = HXutility('H102', ins=H101-0, T=config.FERMENTATION_TEMP_C + 273.15)
-
-# R201: Fermentation Reactor
-R201 = LacticAcidFermentation(
-    'R201',
-    ins=H102-0,
-    outs='fermentation_broth',
-    tau=config.FERMENTATION_TIME,
-    conversion=config.GLUCOSE_CONVERSION,
-    biomass_yield=config.BIOMASS_YIELD
-)
-
-# S301: Centrifuge (cell separation)
-S301 = SolidsCentrifuge(
-    'S301',
-    ins=R201-0,
-    outs=('clarified_broth', 'cell_waste'),
-    split=dict(
-        Water=config.WATER_SPLIT,
-        LacticAcid=config.LACTIC_ACID_SPLIT,
-        Glucose=config.GLUCOSE_SPLIT,
-        Ethanol=config.ETHANOL_SPLIT,
-        WWTsludge=config.BIOMASS_SPLIT
-    )
-)
-
-# E301: Evaporator
-E301 = LacticAcidEvaporator(
-    'E301',
-    ins=S301-0,
-    outs=('concentrated_LA', 'water_vapor'),
-    V=config.WATER_REMOVAL_FRACTION,
-    P=config.EVAPORATION_PRESSURE_KPA * 1000
-)
-
-# H301: Product cooling
-H301 = HXutility('H301', ins=E301-0, outs='lactic_acid_product', T=config.PRODUCT_TEMP_C + 273.15)
-
-# =============================================================================
-# Create System
-# =============================================================================
-
-lactic_acid_sys = bst.System(
-    'lactic_acid_sys',
-    path=(H101, H102, R201, S301, E301, H301),
-    recycle=None
-)
-
-print("\nSystem Units:")
-for unit in lactic_acid_sys.units:
-    print(f"  {unit.ID:6s} - {unit.__class__.__name__}")
-print("-"*80)
+    chems.compile()
+    return chems
+
+def load_chemicals(path=CHEMICALS_CACHE):
+    """
+    Return compiled process chemicals, loading them from the pickle cache
+    at `path` when it is valid and creating (and caching) them otherwise.
+    """
+    source = inspect.getsource(create_chemicals).encode()
+    key = (tmo.__version__, hashlib.sha1(source).hexdigest())
+    try:
+        with open(path, 'rb') as file:
+            cached_key, chems = pickle.load(file)
+        if cached_key == key: return chems
+    except Exception:
+        pass
+    chems = create_chemicals()
+    try:
+        with open(path, 'wb') as file:
+            pickle.dump((key, chems), file)
+    except OSError:
+        pass
+    return chems
 
 # =============================================================================
 # TEA Class
@@ -176,205 +108,395 @@ class LacticAcidTEA(bst.TEA):
         super()._solve_IRR()
 
 # =============================================================================
-# Simulate
+# Create System
 # =============================================================================
 
-print("\n" + "="*80)
-print("SIMULATING...")
-print("="*80)
+@functools.lru_cache(maxsize=None)
+def build_system():
+    """
+    Create the chemicals, streams, unit operations, system and TEA.
+    
+    The system is built once per session and cached; parameter sweeps
+    should go through `run` so that thermo objects and the unit graph
+    are reused instead of rebuilt for every scenario.
+    """
+    bst.CE = config.CEPCI
+    bst.PowerUtility.price = config.ELECTRICITY_PRICE
+    bst.main_flowsheet.set_flowsheet('lactic_acid')
+    
+    tmo.settings.set_thermo(load_chemicals())
+    
+    # Streams
+    glucose_feed = Stream(
+        'glucose_feed',
+        Glucose=config.GLUCOSE_FEED_RATE,
+        Water=config.GLUCOSE_FEED_RATE * 4,  # 20% w/w solution
+        T=config.FEED_TEMP_C + 273.15,
+        P=101325,
+        units='kg/hr'
+    )
+
+    # Unit operations
+    # H101: Feed Sterilization
+    H101 = HXutility('H101', ins=glucose_feed, T=config.STERILIZATION_TEMP_C + 273.15)
+
+    # H102: Cooling to fermentation temperature
+    H102 = HXutility('H102', ins=H101-0, T=config.FERMENTATION_TEMP_C + 273.15)
+
+    # R201: Fermentation Reactor
+    R201 = LacticAcidFermentation(
+        'R201',
+        ins=H102-0,
+        outs='fermentation_broth',
+        tau=config.FERMENTATION_TIME,
+        conversion=config.GLUCOSE_CONVERSION,
+        biomass_yield=config.BIOMASS_YIELD
+    )
 
-lactic_acid_sys.simulate()
-print("✓ Simulation completed!\n")
+    # S301: Centrifuge (cell separation)
+    S301 = SolidsCentrifuge(
+        'S301',
+        ins=R201-0,
+        outs=('clarified_broth', 'cell_waste'),
+        split=dict(
+            Water=config.WATER_SPLIT,
+            LacticAcid=config.LACTIC_ACID_SPLIT,
+            Glucose=config.GLUCOSE_SPLIT,
+            Ethanol=config.ETHANOL_SPLIT,
+            WWTsludge=config.BIOMASS_SPLIT
+        )
+    )
 
-# =============================================================================
-# Get Key Streams (needed for calculations)
-# =============================================================================
+    # E301: Evaporator
+    E301 = LacticAcidEvaporator(
+        'E301',
+        ins=S301-0,
+        outs=('concentrated_LA', 'water_vapor'),
+        V=config.WATER_REMOVAL_FRACTION,
+        P=config.EVAPORATION_PRESSURE_KPA * 1000
+    )
 
-product = lactic_acid_sys.flowsheet.stream.lactic_acid_product
-feed_glucose = lactic_acid_sys.flowsheet.stream.glucose_feed
-broth = lactic_acid_sys.flowsheet.stream.fermentation_broth
+    # H301: Product cooling
+    H301 = HXutility('H301', ins=E301-0, outs='lactic_acid_product', T=config.PRODUCT_TEMP_C + 273.15)
+
+    # System
+    lactic_acid_sys = bst.System(
+        'lactic_acid_sys',
+        path=(H101, H102, R201, S301, E301, H301),
+        recycle=None
+    )
+    
+    LacticAcidTEA(
+        system=lactic_acid_sys,
+        IRR=config.IRR_TARGET,
+        duration=(config.PROJECT_START_YEAR, config.PROJECT_END_YEAR),
+        depreciation=config.DEPRECIATION,
+        income_tax=config.INCOME_TAX_RATE,
+        operating_days=config.OPERATING_DAYS,
+        lang_factor=config.LANG_FACTOR,
+        construction_schedule=config.CONSTRUCTION_SCHEDULE,
+        WC_over_FCI=config.WORKING_CAPITAL_FRACTION,
+        startup_months=config.STARTUP_MONTHS,
+        startup_FOCfrac=config.STARTUP_FOC_FRACTION,
+        startup_VOCfrac=config.STARTUP_VOC_FRACTION,
+        startup_salesfrac=config.STARTUP_SALES_FRACTION,
+        finance_interest=config.FINANCE_INTEREST_RATE,
+        finance_years=config.FINANCE_YEARS,
+        finance_fraction=config.FINANCE_FRACTION
+    )
+    
+    return lactic_acid_sys
 
-# =============================================================================
-# Create TEA
-# =============================================================================
 
-tea = LacticAcidTEA(
-    system=lactic_acid_sys,
-    IRR=config.IRR_TARGET,
-    duration=(config.PROJECT_START_YEAR, config.PROJECT_END_YEAR),
-    depreciation=config.DEPRECIATION,
-    income_tax=config.INCOME_TAX_RATE,
-    operating_days=config.OPERATING_DAYS,
-    lang_factor=config.LANG_FACTOR,
-    construction_schedule=config.CONSTRUCTION_SCHEDULE,
-    WC_over_FCI=config.WORKING_CAPITAL_FRACTION,
-    startup_months=config.STARTUP_MONTHS,
-    startup_FOCfrac=config.STARTUP_FOC_FRACTION,
-    startup_VOCfrac=config.STARTUP_VOC_FRACTION,
-    startup_salesfrac=config.STARTUP_SALES_FRACTION,
-    finance_interest=config.FINANCE_INTEREST_RATE,
-    finance_years=config.FINANCE_YEARS,
-    finance_fraction=config.FINANCE_FRACTION
-)
+def run(conversion=None, biomass_yield=None, V=None):
+    """
+    Simulate the cached system, updating only the given parameters.
+    
+    Parameters
+    ----------
+    conversion : float, optional
+        Glucose conversion efficiency of R201 (0-1)
+    biomass_yield : float, optional
+        g biomass / g glucose in R201
+    V : float, optional
+        Fraction of water evaporated in E301 (0-1)
+    """
+    lactic_acid_sys = build_system()
+    unit = lactic_acid_sys.flowsheet.unit
+    if conversion is not None: unit.R201.conversion = conversion
+    if biomass_yield is not None: unit.R201.biomass_yield = biomass_yield
+    if V is not None: unit.E301.V = V
+    lactic_acid_sys.simulate()
+    return lactic_acid_sys
 
 # =============================================================================
-# Calculate Operating Costs Manually
+# Report
 # =============================================================================
 
-# Raw material costs (annual)
-glucose_cost_annual = feed_glucose.imass['Glucose'] * config.OPERATING_HOURS * config.GLUCOSE_PRICE
-nutrients_cost_annual = glucose_cost_annual * 0.05 * config.NUTRIENTS_PRICE / config.GLUCOSE_PRICE
+@functools.lru_cache(maxsize=None)
+def utility_units(lactic_acid_sys):
+    """
+    Return the units with heat utilities and the units with a power utility.
+    
+    Filtered once after the first simulation of `lactic_acid_sys`; the
+    flowsheet is fixed, so later runs reuse the same tuples.
+    """
+    units = lactic_acid_sys.units
+    heat_units = tuple([u for u in units if u.heat_utilities])
+    power_units = tuple([u for u in units if getattr(u, 'power_utility', None) is not None])
+    return heat_units, power_units
+
 
-# Utility costs (annual) - from BioSTEAM
-utility_cost_annual = tea.utility_cost
+def mass(stream, i):
+    """Mass flow rate (kg/hr) of the chemical at index `i` in `stream`."""
+    return stream.imass.data[i]
 
-# Fixed operating costs (annual) - from TEA
-fixed_cost_annual = tea.FOC
 
-# Total operating cost
-total_operating_cost = glucose_cost_annual + nutrients_cost_annual + utility_cost_annual + fixed_cost_annual
+def report(lactic_acid_sys, verbose=True):
+    """
+    Calculate production, energy, cost and profitability results.
+    
+    Results are returned as a dict; with `verbose` (default), the full
+    report is also formatted into a single buffer and written to stdout
+    in one call. Pass ``verbose=False`` in scenario loops to skip
+    formatting entirely.
+    """
+    tea = lactic_acid_sys.TEA
+    
+    # Get key streams (needed for calculations)
+    stream = lactic_acid_sys.flowsheet.stream
+    product = stream.lactic_acid_product
+    feed_glucose = stream.glucose_feed
+    broth = stream.fermentation_broth
+    
+    chems = product.chemicals
+    i_glu = chems.index('Glucose')
+    i_la = chems.index('LacticAcid')
+    
+    # Operating costs (calculated manually)
+
+    # Raw material costs (annual)
+    glucose_cost_annual = mass(feed_glucose, i_glu) * config.OPERATING_HOURS * config.GLUCOSE_PRICE
+    nutrients_cost_annual = glucose_cost_annual * config.NUTRIENTS_LOADING * config.NUTRIENTS_PRICE / config.GLUCOSE_PRICE
+
+    # Utility costs (annual) - from BioSTEAM
+    utility_cost_annual = tea.utility_cost
+
+    # Fixed operating costs (annual) - from TEA
+    fixed_cost_annual = tea.FOC
+
+    # Total operating cost
+    total_operating_cost = glucose_cost_annual + nutrients_cost_annual + utility_cost_annual + fixed_cost_annual
+
+    # Production metrics (one mass array snapshot and sum per stream)
+    m_product = product.imass.data
+    m_broth = broth.imass.data
+    F_product = m_product.sum()
+    F_broth = m_broth.sum()
+    la_production = m_product[i_la]
+    product_conc = la_production / F_product  # w/w
+    broth_conc = m_broth[i_la] / F_broth  # w/w
+    annual_production = la_production * config.OPERATING_HOURS / 1000
+    # Get actual masses (not molar)
+    glucose_consumed = mass(feed_glucose, i_glu) - m_broth[i_glu]  # kg/hr
+    la_produced = la_production  # kg/hr
+
+    # This should account for biomass and byproducts
+    overall_yield = la_produced / glucose_consumed if glucose_consumed > 0 else 0
+
+    # Also calculate theoretical yield percentage
+    theoretical_yield = 1.0  # kg LA per kg glucose (stoichiometry)
+    yield_efficiency = overall_yield / theoretical_yield * 100
+
+    # Energy
+    heat_units, power_units = utility_units(lactic_acid_sys)
+    duties = np.fromiter((u.heat_utilities[0].duty for u in heat_units),
+                         dtype=np.float64, count=len(heat_units))
+    total_heating = duties[duties > 0].sum() / 1e6
+    total_cooling = -duties[duties < 0].sum() / 1e6
+    total_power = np.fromiter((u.power_utility.consumption for u in power_units),
+                              dtype=np.float64, count=len(power_units)).sum() / 1e3
+
+    # Equipment costs (snapshot each unit's cost properties once)
+    costs = np.array(
+        [(u.ID, u.__class__.__name__, u.purchase_cost, u.installed_cost)
+         for u in lactic_acid_sys.units],
+        dtype=[('ID', 'O'), ('equipment', 'O'), ('purchase', 'f8'), ('installed', 'f8')]
+    )
+    costs = costs[costs['purchase'] > 0]
+    total_purchase = costs['purchase'].sum()
+    total_installed = costs['installed'].sum()
+
+    # Operating costs breakdown
+    unit_cost = total_operating_cost / (annual_production * 1000) if annual_production > 0 else 0
+
+    # Profitability
+    annual_revenue = annual_production * 1000 * config.LACTIC_ACID_PRICE
+    annual_profit = annual_revenue - total_operating_cost
+    gross_margin = (annual_profit / annual_revenue * 100) if annual_revenue > 0 else 0
+
+    # NPV calculation (use actual operating cost)
+    years = config.PROJECT_END_YEAR - config.PROJECT_START_YEAR
+    annual_cash_flow = (annual_revenue - total_operating_cost) * (1 - tea.income_tax)
+    discount_factors = (1 + tea.IRR) ** np.arange(1, years + 1)
+    NPV = -tea.TCI + (annual_cash_flow / discount_factors).sum()
+
+    # MSP (minimum selling price to achieve target IRR)
+    # MSP = (Total Operating Cost + Required Return) / Production
+    required_annual_return = tea.TCI * tea.IRR
+    min_selling_price = (total_operating_cost + required_annual_return) / (annual_production * 1000)
+
+    # Simple payback period
+    simple_payback = tea.TCI / annual_profit if annual_profit > 0 else 0
+
+    results = {
+        'LA production': la_production,  # kg/hr
+        'Annual production': annual_production,  # MT/yr
+        'Overall yield': overall_yield,  # kg LA/kg glucose
+        'Product concentration': product_conc,  # w/w
+        'Heating duty': total_heating,  # MW
+        'Cooling duty': total_cooling,  # MW
+        'Electric power': total_power,  # MW
+        'TCI': tea.TCI,
+        'Purchase cost': total_purchase,
+        'Operating cost': total_operating_cost,  # $/yr
+        'MSP': min_selling_price,  # $/kg
+        'NPV': NPV,
+    }
+    if not verbose: return results
+    
+    # Format the whole report into one buffer and write it once
+    lines = []
+    out = lines.append
+    
+    out("="*80)
+    out("PRODUCTION METRICS")
+    out("="*80)
+    out(f"Lactic Acid Production:          {la_production:.2f} kg/hr")
+    out(f"Annual Production:               {annual_production:.2f} MT/year")
+    out(f"Target Achievement:              {annual_production/config.ANNUAL_PRODUCTION_TARGET*100:.1f}%")
+    out(f"Product Concentration:           {product_conc*100:.1f}% w/w")
+    out(f"Fermentation Broth Conc:         {broth_conc*100:.1f}% w/w")
+    out(f"Overall Yield:                   {overall_yield:.2f} kg LA/kg glucose ({yield_efficiency:.0f}% of theoretical)")
+
+    out(f"\n{'='*80}")
+    out("ENERGY REQUIREMENTS")
+    out("="*80)
+    out(f"Heating Duty:                    {total_heating:.3f} MW")
+    out(f"Cooling Duty:                    {total_cooling:.3f} MW")
+    out(f"Electric Power:                  {total_power:.3f} MW")
+    if la_production > 0:
+        out(f"Specific Energy:                 {total_power*1000/la_production:.2f} kWh/ton LA")
+
+    # Economics
+    out(f"\n{'='*80}")
+    out("CAPITAL INVESTMENT")
+    out("="*80)
+    out(f"Total Capital Investment:        ${tea.TCI/1e6:.2f} million")
+    out(f"Fixed Capital Investment:        ${tea.FCI/1e6:.2f} million")
+    out(f"Working Capital:                 ${tea.working_capital/1e6:.2f} million")
+    if annual_production > 0:
+        out(f"Specific Investment:             ${tea.TCI/(annual_production*1000):.2f}/kg annual capacity")
+
+    # Equipment costs
+    out(f"\n{'='*80}")
+    out("EQUIPMENT COSTS")
+    out("="*80)
+    out(f"{'Unit':<10} {'Equipment':<30} {'Purchase ($k)':>15} {'Installed ($k)':>15}")
+    out("-"*80)
+    for ID, equipment, purchase, installed in costs:
+        out(f"{ID:<10} {equipment:<30} "
+            f"{purchase/1e3:>15.1f} {installed/1e3:>15.1f}")
+    out("-"*80)
+    out(f"{'TOTAL':<42} {total_purchase/1e6:>14.2f}M {total_installed/1e6:>14.2f}M")
+
+    out(f"\n{'='*80}")
+    out("ANNUAL OPERATING COSTS")
+    out("="*80)
+    out(f"Raw Materials:")
+    out(f"  Glucose (${config.GLUCOSE_PRICE:.2f}/kg):          ${glucose_cost_annual/1e6:.2f} million/year")
+    out(f"  Nutrients & pH control:          ${nutrients_cost_annual/1e6:.2f} million/year")
+    out(f"Utilities (steam, cooling, power): ${utility_cost_annual/1e6:.2f} million/year")
+    out(f"Fixed costs (labor, maintenance):  ${fixed_cost_annual/1e6:.2f} million/year")
+    out(f"{'-'*80}")
+    out(f"Total Annual Operating Cost:       ${total_operating_cost/1e6:.2f} million/year")
+    out(f"\nUnit Production Cost:              ${unit_cost:.3f}/kg")
+
+    out(f"\n{'='*80}")
+    out(f"PROJECT ECONOMICS (LA price: ${config.LACTIC_ACID_PRICE:.2f}/kg)")
+    out("="*80)
+    out(f"Annual Revenue:                  ${annual_revenue/1e6:.2f} million")
+    out(f"Annual Profit (before tax):      ${annual_profit/1e6:.2f} million")
+    out(f"Gross Margin:                    {gross_margin:.1f}%")
+    out(f"\nMinimum Selling Price (MSP):     ${min_selling_price:.3f}/kg")
+    out(f"Net Present Value (NPV):         ${NPV/1e6:.2f} million")
+    out(f"Internal Rate of Return (IRR):   {tea.IRR*100:.2f}%")
+
+    if annual_profit > 0:
+        out(f"Simple Payback Period:           {simple_payback:.2f} years")
+
+    out(f"\n{'='*80}")
+    out("KEY PERFORMANCE INDICATORS")
+    out("="*80)
+    out(f"Production Capacity:             {config.ANNUAL_PRODUCTION_TARGET:,} MT/year")
+    out(f"Capacity Utilization:            {config.OPERATING_DAYS/365*100:.1f}%")
+    out(f"Glucose-to-LA Yield:             {overall_yield:.2f} kg/kg ({overall_yield/1.0*100:.0f}% theoretical)")
+    out(f"Product Concentration:           {product_conc*100:.0f}% w/w")
+    if la_production > 0:
+        # FIX: Convert MW to kW, then divide by tons/hr (not kg/hr)
+        out(f"Energy Intensity:                {(total_power*1000)/(la_production/1000):.1f} kWh/ton LA")
+    if annual_production > 0:
+        # FIX: TCI is already in dollars, divide by MT (not kg)
+        out(f"CAPEX per Annual Ton:            ${tea.TCI/(annual_production):.0f}/ton")
+    out(f"OPEX per kg LA:                  ${unit_cost:.2f}/kg")
+    out(f"Profit Margin:                   {gross_margin:.1f}%")
+    out(f"ROI (IRR):                       {tea.IRR*100:.1f}%")
+    out(f"NPV (20 years):                  ${NPV/1e6:.1f} million")
+
+    out(f"\n{'='*80}")
+    out("SIMULATION COMPLETE")
+    out("="*80)
+    out(f"\n✓ Process: Glucose → Lactic Acid ({config.ANNUAL_PRODUCTION_TARGET:,} MT/year)")
+    out(f"✓ Economics: NPV = ${NPV/1e6:.1f}M, IRR = {tea.IRR*100:.1f}%, MSP = ${min_selling_price:.2f}/kg")
+    out("="*80 + "\n")
+    sys.stdout.write('\n'.join(lines) + '\n')
+    return results
 
 # =============================================================================
-# Display Results
+# Main
 # =============================================================================
 
-# Production metrics
-la_production = product.imass['LacticAcid']
-annual_production = la_production * config.OPERATING_HOURS / 1000
-glucose_consumed = feed_glucose.imass['Glucose'] - broth.imass['Glucose']
-# Get actual masses (not molar)
-glucose_consumed = feed_glucose.imass['Glucose'] - broth.imass['Glucose']  # kg/hr
-la_produced = product.imass['LacticAcid']  # kg/hr
-
-# This should account for biomass and byproducts
-overall_yield = la_produced / glucose_consumed if glucose_consumed > 0 else 0
-
-# Also calculate theoretical yield percentage
-theoretical_yield = 1.0  # kg LA per kg glucose (stoichiometry)
-yield_efficiency = overall_yield / theoretical_yield * 100
-
-print("="*80)
-print("PRODUCTION METRICS")
-print("="*80)
-print(f"Lactic Acid Production:          {la_production:.2f} kg/hr")
-print(f"Annual Production:               {annual_production:.2f} MT/year")
-print(f"Target Achievement:              {annual_production/config.ANNUAL_PRODUCTION_TARGET*100:.1f}%")
-print(f"Product Concentration:           {product.imass['LacticAcid']/product.F_mass*100:.1f}% w/w")
-print(f"Fermentation Broth Conc:         {broth.imass['LacticAcid']/broth.F_mass*100:.1f}% w/w")
-print(f"Overall Yield:                   {overall_yield:.2f} kg LA/kg glucose ({yield_efficiency:.0f}% of theoretical)")
-
-# Energy
-total_heating = sum([u.heat_utilities[0].duty for u in lactic_acid_sys.units 
-                     if u.heat_utilities and len(u.heat_utilities) > 0 and u.heat_utilities[0].duty > 0]) / 1e6
-total_cooling = sum([abs(u.heat_utilities[0].duty) for u in lactic_acid_sys.units 
-                     if u.heat_utilities and len(u.heat_utilities) > 0 and u.heat_utilities[0].duty < 0]) / 1e6
-total_power = sum([u.power_utility.consumption for u in lactic_acid_sys.units 
-                   if hasattr(u, 'power_utility') and u.power_utility]) / 1e3
-
-print(f"\n{'='*80}")
-print("ENERGY REQUIREMENTS")
-print("="*80)
-print(f"Heating Duty:                    {total_heating:.3f} MW")
-print(f"Cooling Duty:                    {total_cooling:.3f} MW")
-print(f"Electric Power:                  {total_power:.3f} MW")
-if la_production > 0:
-    print(f"Specific Energy:                 {total_power*1000/la_production:.2f} kWh/ton LA")
-
-# Economics
-print(f"\n{'='*80}")
-print("CAPITAL INVESTMENT")
-print("="*80)
-print(f"Total Capital Investment:        ${tea.TCI/1e6:.2f} million")
-print(f"Fixed Capital Investment:        ${tea.FCI/1e6:.2f} million")
-print(f"Working Capital:                 ${tea.working_capital/1e6:.2f} million")
-if annual_production > 0:
-    print(f"Specific Investment:             ${tea.TCI/(annual_production*1000):.2f}/kg annual capacity")
-
-# Equipment costs
-print(f"\n{'='*80}")
-print("EQUIPMENT COSTS")
-print("="*80)
-print(f"{'Unit':<10} {'Equipment':<30} {'Purchase ($k)':>15} {'Installed ($k)':>15}")
-print("-"*80)
-total_purchase = 0
-total_installed = 0
-for unit in lactic_acid_sys.units:
-    if hasattr(unit, 'purchase_cost') and unit.purchase_cost > 0:
-        installed = unit.installed_cost if hasattr(unit, 'installed_cost') else unit.purchase_cost * 2.5
-        print(f"{unit.ID:<10} {unit.__class__.__name__:<30} "
-              f"{unit.purchase_cost/1e3:>15.1f} {installed/1e3:>15.1f}")
-        total_purchase += unit.purchase_cost
-        total_installed += installed
-print("-"*80)
-print(f"{'TOTAL':<42} {total_purchase/1e6:>14.2f}M {total_installed/1e6:>14.2f}M")
-
-# Operating costs breakdown
-unit_cost = total_operating_cost / (annual_production * 1000) if annual_production > 0 else 0
-
-print(f"\n{'='*80}")
-print("ANNUAL OPERATING COSTS")
-print("="*80)
-print(f"Raw Materials:")
-print(f"  Glucose (${config.GLUCOSE_PRICE:.2f}/kg):          ${glucose_cost_annual/1e6:.2f} million/year")
-print(f"  Nutrients & pH control:          ${nutrients_cost_annual/1e6:.2f} million/year")
-print(f"Utilities (steam, cooling, power): ${utility_cost_annual/1e6:.2f} million/year")
-print(f"Fixed costs (labor, maintenance):  ${fixed_cost_annual/1e6:.2f} million/year")
-print(f"{'-'*80}")
-print(f"Total Annual Operating Cost:       ${total_operating_cost/1e6:.2f} million/year")
-print(f"\nUnit Production Cost:              ${unit_cost:.3f}/kg")
-
-# Profitability
-annual_revenue = annual_production * 1000 * config.LACTIC_ACID_PRICE
-annual_profit = annual_revenue - total_operating_cost
-gross_margin = (annual_profit / annual_revenue * 100) if annual_revenue > 0 else 0
-
-# NPV calculation (use actual operating cost)
-years = config.PROJECT_END_YEAR - config.PROJECT_START_YEAR
-annual_cash_flow = (annual_revenue - total_operating_cost) * (1 - tea.income_tax)
-NPV = -tea.TCI
-for year in range(1, years + 1):
-    NPV += annual_cash_flow / ((1 + tea.IRR) ** year)
-
-# MSP (minimum selling price to achieve target IRR)
-# MSP = (Total Operating Cost + Required Return) / Production
-required_annual_return = tea.TCI * tea.IRR
-min_selling_price = (total_operating_cost + required_annual_return) / (annual_production * 1000)
-
-print(f"\n{'='*80}")
-print(f"PROJECT ECONOMICS (LA price: ${config.LACTIC_ACID_PRICE:.2f}/kg)")
-print("="*80)
-print(f"Annual Revenue:                  ${annual_revenue/1e6:.2f} million")
-print(f"Annual Profit (before tax):      ${annual_profit/1e6:.2f} million")
-print(f"Gross Margin:                    {gross_margin:.1f}%")
-print(f"\nMinimum Selling Price (MSP):     ${min_selling_price:.3f}/kg")
-print(f"Net Present Value (NPV):         ${NPV/1e6:.2f} million")
-print(f"Internal Rate of Return (IRR):   {tea.IRR*100:.2f}%")
-
-if annual_profit > 0:
-    simple_payback = tea.TCI / annual_profit if annual_profit > 0 else 0
-    print(f"Simple Payback Period:           {simple_payback:.2f} years")
-
-print(f"\n{'='*80}")
-print("KEY PERFORMANCE INDICATORS")
-print("="*80)
-print(f"Production Capacity:             {config.ANNUAL_PRODUCTION_TARGET:,} MT/year")
-print(f"Capacity Utilization:            {config.OPERATING_DAYS/365*100:.1f}%")
-print(f"Glucose-to-LA Yield:             {overall_yield:.2f} kg/kg ({overall_yield/1.0*100:.0f}% theoretical)")
-print(f"Product Concentration:           {product.imass['LacticAcid']/product.F_mass*100:.0f}% w/w")
-if la_production > 0:
-    # FIX: Convert MW to kW, then divide by tons/hr (not kg/hr)
-    print(f"Energy Intensity:                {(total_power*1000)/(la_production/1000):.1f} kWh/ton LA")
-if annual_production > 0:
-    # FIX: TCI is already in dollars, divide by MT (not kg)
-    print(f"CAPEX per Annual Ton:            ${tea.TCI/(annual_production):.0f}/ton")
-print(f"OPEX per kg LA:                  ${unit_cost:.2f}/kg")
-print(f"Profit Margin:                   {gross_margin:.1f}%")
-print(f"ROI (IRR):                       {tea.IRR*100:.1f}%")
-print(f"NPV (20 years):                  ${NPV/1e6:.1f} million")
-
-print(f"\n{'='*80}")
-print("SIMULATION COMPLETE")
-print("="*80)
-print(f"\n✓ Process: Glucose → Lactic Acid ({config.ANNUAL_PRODUCTION_TARGET:,} MT/year)")
-print(f"✓ Economics: NPV = ${NPV/1e6:.1f}M, IRR = {tea.IRR*100:.1f}%, MSP = ${min_selling_price:.2f}/kg")
-print("="*80 + "\n")
\ No newline at end of file
+if __name__ == '__main__':
+    print("="*80)
+    print("LACTIC ACID BIOREFINERY - BioSTEAM SIMULATION")
+    print("="*80)
+    print(f"BioSTEAM version: {bst.__version__}")
+    print(f"ThermoSTEAM version: {tmo.__version__}")
+    print("-"*80)
+    
+    lactic_acid_sys = build_system()
+    
+    print("\nChemicals loaded:")
+    for chem in tmo.settings.chemicals:
+        print(f"  - {chem.ID}: {chem.formula}")
+    print("-"*80)
+    
+    print(f"\nProduction Target: {config.ANNUAL_PRODUCTION_TARGET:,} MT/year")
+    print(f"Operating days: {config.OPERATING_DAYS} days/year")
+    print(f"Required LA production rate: {config.LA_PRODUCTION_RATE:.1f} kg/hr")
+    print(f"Required glucose feed rate: {config.GLUCOSE_FEED_RATE:.1f} kg/hr")
+    print("-"*80)
+    
+    print("\nSystem Units:")
+    for unit in lactic_acid_sys.units:
+        print(f"  {unit.ID:6s} - {unit.__class__.__name__}")
+    print("-"*80)
+    
+    print("\n" + "="*80)
+    print("SIMULATING...")
+    print("="*80)
+    
+    run()
+    print("✓ Simulation completed!\n")
+    
+    report(lactic_acid_sys)
@@ -0,0 +1,224 @@
+"""
+Vectorized sensitivity analysis for the lactic acid biorefinery.
+
+Batched NumPy version of the custom unit mass balances, cost correlations
+and simplified economics used in run_simulation.py. Every scenario input is
+an array of shape (N,), so N scenarios are evaluated in one pass instead of
+N calls to ``System.simulate()``.
+
+This is a screening model: the heat exchangers, centrifuge and utilities
+(costed by BioSTEAM in the full simulation) are lumped into
+``other_purchase_cost`` and ``utility_cost``, which default to their values
+in one base-case simulation of the full flowsheet. Use it to explore
+parameter ranges, then confirm selected scenarios with run_simulation.py.
+
+Author: Susila Hadiyati
+Date: October 2025
+"""
+
+import functools
+
+import numpy as np
+
+import config
+import run_simulation
+from units import LacticAcidFermentation, LacticAcidEvaporator
+from units.fermentation import _ETHANOL_YIELD
+
+
+@functools.lru_cache(maxsize=None)
+def base_case():
+    """
+    Return the quantities taken from one full simulation at the config
+    values: feed flows (kg/hr), broth densities (kg/m³), the centrifuge
+    moisture content, the water molecular weight, the purchase cost of the
+    equipment not modeled here ($) and the annual utility cost ($/yr).
+    
+    Densities are held at their base-case values across scenarios. Resets
+    R201 and E301 of the cached ``run_simulation`` system to the config
+    values.
+    """
+    lactic_acid_sys = run_simulation.run(
+        conversion=config.GLUCOSE_CONVERSION,
+        biomass_yield=config.BIOMASS_YIELD,
+        V=config.WATER_REMOVAL_FRACTION,
+    )
+    unit = lactic_acid_sys.flowsheet.unit
+    feed = lactic_acid_sys.flowsheet.stream.glucose_feed
+    broth = unit.R201.outs[0]
+    clarified_broth = unit.S301.outs[0]
+    modeled = (unit.R201, unit.E301)
+    return {
+        'Glucose feed': feed.imass['Glucose'],
+        'Water feed': feed.imass['Water'],
+        'Broth density': broth.F_mass / broth.F_vol,
+        'Clarified density': clarified_broth.F_mass / clarified_broth.F_vol,
+        'Moisture content': unit.S301.moisture_content,
+        'Water MW': feed.chemicals.Water.MW,
+        'Other purchase cost': sum([u.purchase_cost for u in lactic_acid_sys.units
+                                    if u not in modeled]),
+        'Utility cost': lactic_acid_sys.TEA.utility_cost,
+    }
+
+
+def fixed_operating_cost(FCI):
+    """Fixed operating costs [$/yr], array form of ``LacticAcidTEA._FOC``."""
+    maintenance = config.MAINTENANCE_FRACTION * FCI
+    labor = config.LABOR_COST_ANNUAL
+    supervision = config.SUPERVISION_FRACTION * labor
+    laboratory = config.LABORATORY_FRACTION * labor
+    insurance = config.INSURANCE_FRACTION * FCI
+    overhead = config.OVERHEAD_FRACTION * (labor + supervision + maintenance)
+
+    return maintenance + labor + supervision + laboratory + insurance + overhead
+
+
+def reactor_purchase_cost(V):
+    """Fermentation reactor purchase cost [$] for total volumes V [m³]."""
+    n = np.ceil(V / LacticAcidFermentation._REACTOR_SIZE)
+    V_per_reactor = np.where(n > 0, V / np.maximum(n, 1), V)
+    return LacticAcidFermentation._COST_COEFF * V_per_reactor**0.65 * n
+
+
+def evaporator_purchase_cost(V, A):
+    """Evaporator purchase cost [$] for volumes V [m³] and areas A [m²]."""
+    vessel_cost = LacticAcidEvaporator._VESSEL_K * np.maximum(V, 0)**0.6
+    hx_cost = LacticAcidEvaporator._HX_K * np.maximum(A, 0)**0.65
+    return vessel_cost + hx_cost
+
+
+def evaluate(conversion=config.GLUCOSE_CONVERSION,
+             biomass_yield=config.BIOMASS_YIELD,
+             V=config.WATER_REMOVAL_FRACTION,
+             tau=config.FERMENTATION_TIME,
+             glucose_price=config.GLUCOSE_PRICE,
+             lactic_acid_price=config.LACTIC_ACID_PRICE,
+             other_purchase_cost=None,
+             utility_cost=None):
+    """
+    Evaluate a batch of scenarios.
+
+    Parameters
+    ----------
+    conversion : float or array
+        Glucose conversion efficiency (0-1)
+    biomass_yield : float or array
+        g biomass / g glucose
+    V : float or array
+        Fraction of water removed in the evaporator (0-1)
+    tau : float or array
+        Fermentation time (hours)
+    glucose_price, lactic_acid_price : float or array
+        Prices ($/kg)
+    other_purchase_cost : float or array, optional
+        Purchase cost of equipment not modeled here ($). Defaults to the
+        base-case value, see ``base_case``.
+    utility_cost : float or array, optional
+        Annual utility cost ($/yr). Defaults to the base-case value.
+
+    Returns
+    -------
+    dict[str, ndarray]
+        Production rate, capital and operating costs, MSP and NPV of each
+        scenario, all broadcast to a common shape.
+    """
+    case = base_case()
+    if other_purchase_cost is None: other_purchase_cost = case['Other purchase cost']
+    if utility_cost is None: utility_cost = case['Utility cost']
+    (conversion, biomass_yield, V, tau, glucose_price, lactic_acid_price,
+     other_purchase_cost, utility_cost) = np.broadcast_arrays(
+        *[np.asarray(i, dtype=float) for i in (
+            conversion, biomass_yield, V, tau, glucose_price, lactic_acid_price,
+            other_purchase_cost, utility_cost
+        )]
+    )
+    hours = config.OPERATING_HOURS
+
+    # Fermentation (mass basis, kg/hr), see LacticAcidFermentation._run
+    glucose_kg = case['Glucose feed']
+    water_kg = case['Water feed']
+    glucose_reacted = glucose_kg * conversion
+    la_kg = glucose_reacted * (1.0 - biomass_yield - _ETHANOL_YIELD)
+    biomass_kg = glucose_reacted * biomass_yield
+    ethanol_kg = glucose_reacted * _ETHANOL_YIELD
+    glucose_left = glucose_kg - glucose_reacted
+
+    reactor_volume = (glucose_kg + water_kg) / case['Broth density'] * tau
+
+    # Centrifuge, see SolidsCentrifuge: solutes follow the component splits
+    # and water is set by the moisture content of the clarified broth
+    la_l = la_kg * config.LACTIC_ACID_SPLIT
+    dry_kg = (
+        la_l
+        + glucose_left * config.GLUCOSE_SPLIT
+        + ethanol_kg * config.ETHANOL_SPLIT
+        + biomass_kg * config.BIOMASS_SPLIT
+    )
+    moisture = case['Moisture content']
+    water_l = dry_kg * moisture / (1 - moisture)
+    clarified_kg = dry_kg + water_l
+
+    # Evaporator, see LacticAcidEvaporator._design
+    evaporator_volume = clarified_kg / case['Clarified density'] * LacticAcidEvaporator._TAU
+    water_evap = water_l / case['Water MW'] * V  # kmol/hr
+    Q = water_evap * LacticAcidEvaporator._HVAP  # kW
+    A = Q * LacticAcidEvaporator._UA_INV
+
+    # Capital
+    purchase_cost = (
+        reactor_purchase_cost(reactor_volume)
+        + evaporator_purchase_cost(evaporator_volume, A)
+        + other_purchase_cost
+    )
+    FCI = purchase_cost * config.LANG_FACTOR
+    TCI = FCI * (1 + config.WORKING_CAPITAL_FRACTION)
+
+    # Operating costs
+    glucose_cost = glucose_kg * hours * glucose_price
+    nutrients_cost = glucose_kg * hours * config.NUTRIENTS_LOADING * config.NUTRIENTS_PRICE
+    operating_cost = glucose_cost + nutrients_cost + utility_cost + fixed_operating_cost(FCI)
+
+    # Economics, as in run_simulation.py
+    annual_production = la_l * hours  # kg/yr
+    revenue = annual_production * lactic_acid_price
+    MSP = (operating_cost + TCI * config.IRR_TARGET) / annual_production
+    years = config.PROJECT_END_YEAR - config.PROJECT_START_YEAR
+    annuity = (1 / (1 + config.IRR_TARGET) ** np.arange(1, years + 1)).sum()
+    NPV = -TCI + (revenue - operating_cost) * (1 - config.INCOME_TAX_RATE) * annuity
+
+    return {
+        'LA production': la_l,
+        'Reactor volume': reactor_volume,
+        'Evaporator volume': evaporator_volume,
+        'Heat transfer area': A,
+        'Purchase cost': purchase_cost,
+        'TCI': TCI,
+        'Operating cost': operating_cost,
+        'MSP': MSP,
+        'NPV': NPV,
+    }
+
+
+if __name__ == '__main__':
+    N = 10000
+    rng = np.random.default_rng(0)
+    results = evaluate(
+        conversion=rng.uniform(0.80, 0.95, N),
+        biomass_yield=rng.uniform(0.05, 0.12, N),
+        V=rng.uniform(0.60, 0.80, N),
+        glucose_price=rng.uniform(0.30, 0.40, N),
+    )
+
+    print("="*80)
+    print(f"SENSITIVITY ANALYSIS ({N:,} scenarios)")
+    print("="*80)
+    print(f"{'Metric':<30} {'P5':>15} {'P50':>15} {'P95':>15}")
+    print("-"*80)
+    for name, scale, unit in (('LA production', 1, 'kg/hr'),
+                              ('TCI', 1e6, '$M'),
+                              ('Operating cost', 1e6, '$M/yr'),
+                              ('MSP', 1, '$/kg'),
+                              ('NPV', 1e6, '$M')):
+        p5, p50, p95 = np.percentile(results[name] / scale, [5, 50, 95])
+        print(f"{name + ' (' + unit + ')':<30} {p5:>15.3f} {p50:>15.3f} {p95:>15.3f}")
+    print("="*80)
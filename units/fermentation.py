@@ -4,8 +4,35 @@ Lactic acid fermentation reactor.
 Simple custom BioSTEAM unit for glucose → lactic acid fermentation.
 """
 
+import math
+
 import biosteam as bst
 import numpy as np
+from numba import njit
+
+# Molecular weights (kg/kmol) used to split reacted glucose by mass
+_MW_GLUCOSE = 180.0
+_MW_BIOMASS = 25.0  # assumed
+_MW_ETHANOL = 46.0
+_MW_LA = 90.0
+
+# Ethanol byproduct, g ethanol / g glucose reacted
+_ETHANOL_YIELD = 0.02
+
+# Broth temperature (K), 37 °C
+_T_BROTH = 37 + 273.15
+
+
+@njit('void(f8, f8, f8[:], f8[:])', cache=True)
+def _ferment_kernel(glucose, conversion, delta, out):
+    """
+    Write the change in broth flow rates (kmol/hr) into `out` given the
+    glucose entering the reactor and the net kmol formed per kmol glucose
+    reacted.
+    """
+    glucose_reacted = glucose * conversion
+    for i in range(delta.size):
+        out[i] = glucose_reacted * delta[i]
 
 
 class LacticAcidFermentation(bst.Unit):
@@ -28,80 +55,112 @@ class LacticAcidFermentation(bst.Unit):
     _N_outs = 1  # One outlet
     _units = {'Reactor volume': 'm3', 'Number of reactors': ''}
     
+    _REACTOR_SIZE = 100  # m³ per reactor
+    
+    # Six-tenths rule prefactor: $200k for a 100 m³ reactor
+    _COST_COEFF = 200000 / 100**0.65
+    _INSTALL_FACTOR = 2.8
+    
     def __init__(self, ID='', ins=(), outs=(), tau=48, conversion=0.90, biomass_yield=0.08):
         super().__init__(ID, ins, outs)
+        
+        # Resolve chemical indices once so _run can index flow arrays directly
+        chems = self.chemicals
+        self._i_glu = chems.index('Glucose')
+        self._i_la = chems.index('LacticAcid')
+        self._i_bio = chems.index('WWTsludge')
+        self._i_eth = chems.index('Ethanol')
+        
         self.tau = tau
         self.conversion = conversion
         self.biomass_yield = biomass_yield
         
+        # Last design/cost inputs and results, reused while unchanged
+        self._design_cache = (None, None)
+        self._cost_cache = (None, None)
+    
+    @property
+    def biomass_yield(self):
+        """[float] g biomass / g glucose."""
+        return self._biomass_yield
+    @biomass_yield.setter
+    def biomass_yield(self, biomass_yield):
+        self._biomass_yield = biomass_yield
+        self._refresh_coeffs()
+    
+    def _refresh_coeffs(self):
+        """Update the net kmol formed per kmol glucose reacted."""
+        # Mass basis split: biomass takes `biomass_yield` and ethanol 2% of
+        # the glucose mass, lactic acid gets the remainder (not the 2:1
+        # stoichiometry)
+        biomass_yield = self._biomass_yield
+        self._c_biomass = _MW_GLUCOSE * biomass_yield / _MW_BIOMASS
+        self._c_ethanol = _MW_GLUCOSE * _ETHANOL_YIELD / _MW_ETHANOL
+        self._c_la = _MW_GLUCOSE * (1.0 - biomass_yield - _ETHANOL_YIELD) / _MW_LA
+        
+        delta = np.zeros(self.chemicals.size)
+        delta[self._i_glu] = -1.0
+        delta[self._i_la] = self._c_la
+        delta[self._i_bio] = self._c_biomass
+        delta[self._i_eth] = self._c_ethanol
+        self._delta = delta
+        self._dmol = np.zeros_like(delta)  # Kernel output buffer
+        
     def _run(self):
         """Calculate mass balance."""
         feed = self.ins[0]
         broth = self.outs[0]
         
-        # Start with feed composition
-        broth.copy_flow(feed)
-        
-        # Glucose consumption (molar basis)
-        glucose_reacted = feed.imol['Glucose'] * self.conversion
-        
-        # Convert to mass for distribution
-        glucose_mass_reacted = glucose_reacted * 180  # kg/hr
-        
-        # Distribute glucose carbon to products (mass basis)
-        # Total should equal glucose_mass_reacted for mass balance
-        
-        # Biomass: 8% of glucose mass
-        biomass_mass = glucose_mass_reacted * self.biomass_yield  # 8% = 0.08
-        biomass_produced = biomass_mass / 25  # kmol/hr (assume MW=25)
-        
-        # Ethanol: 2% of glucose mass (byproduct)
-        ethanol_mass = glucose_mass_reacted * 0.02  # 2%
-        ethanol_produced = ethanol_mass / 46  # kmol/hr (MW ethanol = 46)
-        
-        # Lactic acid: Remaining glucose (90%)
-        # This is the key fix: don't use stoichiometry directly
-        la_fraction = 1.0 - self.biomass_yield - 0.02  # 1.0 - 0.08 - 0.02 = 0.90
-        lactic_acid_mass = glucose_mass_reacted * la_fraction  # 90%
-        lactic_acid_produced = lactic_acid_mass / 90  # kmol/hr (MW LA = 90)
-        
-        # Update broth composition
-        broth.imol['Glucose'] -= glucose_reacted
-        broth.imol['LacticAcid'] += lactic_acid_produced
-        broth.imol['WWTsludge'] += biomass_produced
-        broth.imol['Ethanol'] += ethanol_produced
+        # Start with feed composition and apply the reaction in one pass
+        feed_mol = feed.mol
+        mol = broth.mol
+        mol[:] = feed_mol
+        dmol = self._dmol
+        _ferment_kernel(feed_mol[self._i_glu], self.conversion, self._delta, dmol)
+        mol += dmol
         
         # Set conditions
-        broth.T = 37 + 273.15
+        broth.T = _T_BROTH
         broth.P = feed.P
         
     def _design(self):
         """Size equipment."""
         broth = self.outs[0]
+        F_vol = broth.F_vol
+        tau = self.tau
+        
+        # Skip resizing when flow and residence time are unchanged
+        key, results = self._design_cache
+        if (results is not None and tau == key[1]
+                and abs(F_vol - key[0]) < 1e-12 * max(1.0, key[0])):
+            self.design_results.update(results)
+            return
         
         # Total volume = Flow rate × Residence time
-        total_volume = broth.F_vol * self.tau
+        total_volume = F_vol * tau
         
         # Use 100 m³ reactors
-        reactor_size = 100
-        n_reactors = np.ceil(total_volume / reactor_size)
+        n_reactors = math.ceil(total_volume / self._REACTOR_SIZE)
         
         self.design_results['Reactor volume'] = total_volume
         self.design_results['Number of reactors'] = n_reactors
+        self._design_cache = ((F_vol, tau), {'Reactor volume': total_volume,
+                                             'Number of reactors': n_reactors})
         
     def _cost(self):
         """Calculate costs."""
         V = self.design_results['Reactor volume']
         n = self.design_results['Number of reactors']
         
-        V_per_reactor = V / n if n > 0 else V
-        
-        # Six-tenths rule scaling
-        base_cost = 200000  # $ for 100 m³
-        unit_cost = base_cost * (V_per_reactor / 100)**0.65
-        total_purchase = unit_cost * n
-        
-        # Store costs
-        self.baseline_purchase_costs['Fermentation reactors'] = total_purchase
-        self.purchase_costs['Fermentation reactors'] = total_purchase
-        self.installed_costs['Fermentation reactors'] = total_purchase * 2.8
\ No newline at end of file
+        # Six-tenths rule scaling (n is 0 only when V is 0), reused while
+        # the design is unchanged
+        key, total = self._cost_cache
+        if key != (V, n):
+            unit_cost = self._COST_COEFF * math.pow(V / (n or 1), 0.65)
+            total = unit_cost * n
+            self._cost_cache = ((V, n), total)
+        
+        # Store costs (cleared by BioSTEAM before every simulation)
+        self.baseline_purchase_costs['Fermentation reactors'] = total
+        self.purchase_costs['Fermentation reactors'] = total
+        self.installed_costs['Fermentation reactors'] = total * self._INSTALL_FACTOR
\ No newline at end of file